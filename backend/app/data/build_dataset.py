@@ -2,18 +2,21 @@
 
 from __future__ import annotations
 
-import json
 import math
 import re
 from pathlib import Path
 from typing import Iterable
 
+import ahocorasick
+import numpy as np
+import orjson
 import pandas as pd
 
 
 ROOT = Path(__file__).resolve().parents[3]
 RAW_DATA_PATH = ROOT / "cultural_objects_mnn.xlsx"
 OUTPUT_PATH = Path(__file__).resolve().parent / "places.json"
+POINT_RE = r"^POINT\s*\(([-\d\.]+)\s+([-\d\.]+)\)"
 
 
 CATEGORY_TAGS = {
@@ -64,7 +67,7 @@ KEYWORD_TAGS = {
 def parse_point(value: str) -> tuple[float, float] | None:
     if not isinstance(value, str):
         return None
-    match = re.match(r"POINT\s*\(([-\d\.]+)\s+([-\d\.]+)\)", value)
+    match = re.match(POINT_RE, value)
     if not match:
         return None
     lon, lat = map(float, match.groups())
@@ -82,61 +85,88 @@ def build_tags(*segments: Iterable[str]) -> list[str]:
     return sorted(tags)
 
 
-def keyword_enrichment(text: str) -> set[str]:
-    text_lower = text.lower()
-    enriched: set[str] = set()
+def _build_keyword_automaton() -> ahocorasick.Automaton:
+    automaton = ahocorasick.Automaton()
     for needle, tag in KEYWORD_TAGS.items():
-        if needle in text_lower:
-            enriched.add(tag)
-    return enriched
+        automaton.add_word(needle, tag)
+    automaton.make_automaton()
+    return automaton
+
+
+KEYWORD_AUTOMATON = _build_keyword_automaton()
+
+
+def keyword_enrichment(text: str) -> set[str]:
+    return {tag for _, tag in KEYWORD_AUTOMATON.iter(text.lower())}
+
+
+def _text_column(df: pd.DataFrame, name: str) -> pd.Series:
+    if name not in df.columns:
+        return pd.Series("", index=df.index)
+    # map(str) mirrors str(value), so missing cells become "nan" on every pandas version.
+    return df[name].map(str).str.strip()
+
+
+def _column_values(df: pd.DataFrame, name: str) -> list:
+    if name not in df.columns:
+        return [None] * len(df)
+    return df[name].tolist()
 
 
 def main() -> None:
     if not RAW_DATA_PATH.exists():
         raise FileNotFoundError(f"Dataset not found at {RAW_DATA_PATH}")
 
-    df = pd.read_excel(RAW_DATA_PATH, sheet_name=0)
-
-    records = []
-    for row in df.itertuples():
-        coords = parse_point(getattr(row, "coordinate", ""))
-        if not coords:
-            continue
-        lat, lon = coords
-        category = getattr(row, "category_id", None)
-        title = str(getattr(row, "title", "")).strip()
-        description = str(getattr(row, "description", "")).strip()
-        address = str(getattr(row, "address", "")).strip()
-
-        base_tags = CATEGORY_TAGS.get(category, [])
-        keyword_tags = keyword_enrichment(f"{title}. {description}")
-        tags = build_tags(base_tags, keyword_tags)
-
-        visit_duration = CATEGORY_ESTIMATED_DURATION.get(category, 60)
-
-        records.append(
-            {
-                "id": int(getattr(row, "id")),
-                "title": title,
-                "description": description,
-                "address": address,
-                "latitude": lat,
-                "longitude": lon,
-                "category_id": int(category) if category is not None else None,
-                "tags": tags,
-                "estimated_visit_minutes": visit_duration,
-                "source_url": (
-                    getattr(row, "url", None)
-                    if not pd.isna(getattr(row, "url", None))
-                    else None
-                ),
-            }
-        )
+    df = pd.read_excel(RAW_DATA_PATH, sheet_name=0, engine="calamine")
 
-    OUTPUT_PATH.write_text(
-        json.dumps(records, ensure_ascii=False, indent=2),
-        encoding="utf-8",
+    coordinates = (
+        df["coordinate"]
+        .astype("string")
+        .str.extract(POINT_RE)
+        .apply(pd.to_numeric, errors="coerce")
     )
+    valid = np.isfinite(coordinates[0]) & np.isfinite(coordinates[1])
+    df = df[valid]
+    longitudes = coordinates.loc[valid, 0].tolist()
+    latitudes = coordinates.loc[valid, 1].tolist()
+
+    titles = _text_column(df, "title")
+    descriptions = _text_column(df, "description")
+    addresses = _text_column(df, "address")
+    categories = _column_values(df, "category_id")
+    urls = _column_values(df, "url")
+
+    keyword_tags = [
+        keyword_enrichment(text) for text in (titles + ". " + descriptions).tolist()
+    ]
+
+    records = [
+        {
+            "id": int(place_id),
+            "title": title,
+            "description": description,
+            "address": address,
+            "latitude": lat,
+            "longitude": lon,
+            "category_id": int(category) if category is not None else None,
+            "tags": build_tags(CATEGORY_TAGS.get(category, []), keywords),
+            "estimated_visit_minutes": CATEGORY_ESTIMATED_DURATION.get(category, 60),
+            "source_url": url if not pd.isna(url) else None,
+        }
+        for place_id, title, description, address, lat, lon, category, url, keywords in zip(
+            df["id"].tolist(),
+            titles.tolist(),
+            descriptions.tolist(),
+            addresses.tolist(),
+            latitudes,
+            longitudes,
+            categories,
+            urls,
+            keyword_tags,
+        )
+    ]
+
+    OUTPUT_PATH.write_bytes(orjson.dumps(records, option=orjson.OPT_INDENT_2))
 
     print(f"Wrote {len(records)} records to {OUTPUT_PATH}")
 
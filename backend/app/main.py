@@ -2,21 +2,32 @@
 
 from __future__ import annotations
 
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
+from typing import AsyncIterator
 
-from fastapi import BackgroundTasks, FastAPI, HTTPException
+import anyio.to_thread
+from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 from dotenv import load_dotenv
 
 from .models import FeedbackRequest, ItineraryRequest, ItineraryResponse
-from .services.feedback import record_feedback
+from .services.feedback import (
+    FEEDBACK_QUEUE_SIZE,
+    build_feedback_payload,
+    feedback_writer,
+)
 from .services.itinerary import ItineraryPlanner
 
 
 BASE_DIR = Path(__file__).resolve().parent
 FRONTEND_DIR = BASE_DIR.parent.parent / "frontend"
+# Caps all threadpool work (StaticFiles, FileResponse, sync routes), not just plan().
+WORKER_THREADS = 16
 
 if not FRONTEND_DIR.exists():
     raise RuntimeError("Frontend directory is missing; expected at ../frontend")
@@ -26,7 +37,21 @@ load_dotenv()
 
 planner = ItineraryPlanner()
 
-app = FastAPI(title="AI Tourist Assistant", version="0.2.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    anyio.to_thread.current_default_thread_limiter().total_tokens = WORKER_THREADS
+    app.state.feedback_queue = asyncio.Queue(maxsize=FEEDBACK_QUEUE_SIZE)
+    writer = asyncio.create_task(feedback_writer(app.state.feedback_queue))
+    try:
+        yield
+    finally:
+        writer.cancel()
+        with suppress(asyncio.CancelledError):
+            await writer
+
+
+app = FastAPI(title="AI Tourist Assistant", version="0.2.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -57,7 +82,8 @@ async def serve_spa() -> FileResponse:
 
 @app.post("/api/itinerary", response_model=ItineraryResponse)
 async def generate_itinerary(payload: ItineraryRequest) -> ItineraryResponse:
-    response, _warnings = planner.plan(
+    response, _warnings = await run_in_threadpool(
+        planner.plan,
         interests=payload.interests,
         available_hours=payload.available_hours,
         location=payload.location,
@@ -66,8 +92,11 @@ async def generate_itinerary(payload: ItineraryRequest) -> ItineraryResponse:
 
 
 @app.post("/api/feedback", status_code=201)
-async def submit_feedback(
-    payload: FeedbackRequest, background: BackgroundTasks
-) -> dict[str, str]:
-    background.add_task(record_feedback, payload)
+async def submit_feedback(payload: FeedbackRequest) -> dict[str, str]:
+    try:
+        app.state.feedback_queue.put_nowait(build_feedback_payload(payload))
+    except asyncio.QueueFull:
+        raise HTTPException(
+            status_code=503, detail="Feedback queue is full, try again later"
+        )
     return {"status": "received"}
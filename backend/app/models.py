@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import FrozenSet, List, Optional
 
 from pydantic import BaseModel, Field, validator
 
@@ -52,6 +52,10 @@ class Place:
     tags: List[str]
     estimated_visit_minutes: int
     source_url: Optional[str]
+    tags_set: FrozenSet[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.tags_set = frozenset(self.tags)
 
     def to_stop(self, reason: str, arrival_time: str) -> ItineraryStop:
         return ItineraryStop(
@@ -64,9 +68,6 @@ class Place:
             longitude=self.longitude,
         )
 
-    def __hash__(self) -> int:
-        return hash(self.id)
-
 
 class FeedbackStop(BaseModel):
     name: str
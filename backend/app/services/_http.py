@@ -0,0 +1,13 @@
+"""Shared HTTP client for outbound API calls."""
+
+from __future__ import annotations
+
+import httpx
+
+
+# One keep-alive pool for every Mistral client, so TLS sessions are reused across calls.
+SHARED_CLIENT = httpx.Client(
+    http2=True,
+    timeout=10,
+    limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+)
@@ -2,22 +2,33 @@
 
 from __future__ import annotations
 
-import json
+from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
 from typing import List
 
+import numpy as np
+import orjson
+
 from ..models import Place
 
 
 DATA_PATH = Path(__file__).resolve().parent.parent / "data" / "places.json"
 
 
+@dataclass(frozen=True, slots=True)
+class PlaceTable:
+    """Координаты всех мест в виде столбцов, в порядке `load_places()`."""
+
+    latitudes: np.ndarray
+    longitudes: np.ndarray
+
+
 @lru_cache(maxsize=1)
 def load_places() -> List[Place]:
     if not DATA_PATH.exists():
         raise FileNotFoundError(f"Не найден подготовленный датасет по пути {DATA_PATH}")
-    raw = json.loads(DATA_PATH.read_text(encoding="utf-8"))
+    raw = orjson.loads(DATA_PATH.read_bytes())
     return [
         Place(
             id=item["id"],
@@ -33,3 +44,16 @@ def load_places() -> List[Place]:
         )
         for item in raw
     ]
+
+
+@lru_cache(maxsize=1)
+def load_place_table() -> PlaceTable:
+    places = load_places()
+    return PlaceTable(
+        latitudes=np.fromiter(
+            (place.latitude for place in places), dtype=np.float64, count=len(places)
+        ),
+        longitudes=np.fromiter(
+            (place.longitude for place in places), dtype=np.float64, count=len(places)
+        ),
+    )
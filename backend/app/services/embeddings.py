@@ -1,23 +1,33 @@
 from __future__ import annotations
 
-import math
 import os
 from functools import lru_cache
-from typing import Iterable, Optional, Sequence, Tuple
+from hashlib import blake2b
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence
 
+import numpy as np
+from diskcache import Index
 from mistralai import Mistral
 
 from ..models import Place
+from ._http import SHARED_CLIENT
 
 
-EmbeddingVector = Tuple[float, ...]
+EmbeddingVector = np.ndarray
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / "data" / "embed_cache"
+EMBED_BATCH_SIZE = 32
 
 
 class EmbeddingProvider:
     def __init__(self) -> None:
         api_key = os.getenv("MISTRAL_API_KEY")
         self._model = os.getenv("MISTRAL_EMBED_MODEL", "mistral-embed")
-        self._client: Optional[Mistral] = Mistral(api_key=api_key) if api_key else None
+        self._client: Optional[Mistral] = (
+            Mistral(api_key=api_key, client=SHARED_CLIENT) if api_key else None
+        )
+        self._cache = Index(str(CACHE_DIR))
 
     def embed_interests(self, interests: Iterable[str]) -> Optional[EmbeddingVector]:
         joined = ", ".join(sorted(set(filter(None, interests)))).strip()
@@ -25,31 +35,43 @@ class EmbeddingProvider:
             return None
         return self._embed_text(joined)
 
-    def semantic_similarity(
-        self, interest_vector: Optional[EmbeddingVector], place: Place
-    ) -> float:
-        if not interest_vector:
-            return 0.0
-        place_vector = self.embed_place(place)
-        if not place_vector:
-            return 0.0
-        return sum(a * b for a, b in zip(interest_vector, place_vector))
-
-    @lru_cache(maxsize=128)
-    def embed_place(self, place: Place) -> Optional[EmbeddingVector]:
+    def embed_places(self, places: Sequence[Place]) -> np.ndarray:
+        """Stacks place vectors into an (N, D) float32 matrix; missing rows are zero."""
+        texts = [self._place_text(place) for place in places]
+        self._embed_batch([text for text in texts if text])
+        # Read back from the disk cache only: texts the batch pass could not embed stay
+        # zero instead of falling through to one API call per place.
+        vectors = [self._cached_vector(text) if text else None for text in texts]
+        dimension = next((len(vector) for vector in vectors if vector is not None), 0)
+        matrix = np.zeros((len(texts), dimension), dtype=np.float32)
+        for row, vector in enumerate(vectors):
+            if vector is not None:
+                matrix[row] = vector
+        return matrix
+
+    @staticmethod
+    def semantic_scores(
+        interest_vector: Optional[EmbeddingVector], place_matrix: np.ndarray
+    ) -> np.ndarray:
+        if interest_vector is None or place_matrix.shape[1] != interest_vector.shape[0]:
+            return np.zeros(place_matrix.shape[0], dtype=np.float64)
+        return (place_matrix @ interest_vector).astype(np.float64)
+
+    @staticmethod
+    def _place_text(place: Place) -> str:
         parts = [
             place.title,
             place.description or "",
             place.address,
             ", ".join(place.tags),
         ]
-        text = " | ".join(part for part in parts if part).strip()
-        if not text:
-            return None
-        return self._embed_text(text)
+        return " | ".join(part for part in parts if part).strip()
 
     @lru_cache(maxsize=2048)
     def _embed_text(self, text: str) -> Optional[EmbeddingVector]:
+        cached = self._cached_vector(text)
+        if cached is not None:
+            return cached
         if not self._client:
             return None
         try:
@@ -58,12 +80,55 @@ class EmbeddingProvider:
             return None
         if not response or not response.data or not response.data[0].embedding:
             return None
-        raw_vector = response.data[0].embedding
-        return self._normalize(raw_vector)
+        vector = self._normalize(response.data[0].embedding)
+        self._store(text, vector)
+        return vector
+
+    def _embed_batch(self, texts: Sequence[str]) -> None:
+        if not self._client:
+            return
+        missing: List[str] = [
+            text for text in dict.fromkeys(texts) if self._cache_key(text) not in self._cache
+        ]
+        for start in range(0, len(missing), EMBED_BATCH_SIZE):
+            chunk = missing[start : start + EMBED_BATCH_SIZE]
+            # A failed chunk is retried once, still as a single batch request.
+            for _attempt in range(2):
+                try:
+                    response = self._client.embeddings.create(
+                        inputs=chunk, model=self._model
+                    )
+                except Exception:
+                    continue
+                if response and response.data:
+                    break
+            else:
+                continue
+            for text, item in zip(chunk, response.data):
+                if item.embedding:
+                    self._store(text, self._normalize(item.embedding))
+
+    def _cached_vector(self, text: str) -> Optional[EmbeddingVector]:
+        cached = self._cache.get(self._cache_key(text))
+        if cached is None:
+            return None
+        return np.frombuffer(cached, dtype=np.float32)
+
+    def _store(self, text: str, vector: Optional[EmbeddingVector]) -> None:
+        if vector is not None:
+            self._cache[self._cache_key(text)] = vector.tobytes()
+
+    def _cache_key(self, text: str) -> bytes:
+        payload = f"{self._model}\n{text}".encode("utf-8")
+        return blake2b(payload, digest_size=16).digest()
 
     @staticmethod
     def _normalize(vector: Sequence[float]) -> Optional[EmbeddingVector]:
-        norm = math.sqrt(sum(component * component for component in vector))
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
         if norm == 0:
             return None
-        return tuple(component / norm for component in vector)
+        normalized = array / norm
+        # Vectors are shared through lru_cache, keep them immutable.
+        normalized.flags.writeable = False
+        return normalized
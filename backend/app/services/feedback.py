@@ -2,19 +2,91 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+import logging
+from contextlib import suppress
 from datetime import datetime
 from pathlib import Path
+from typing import Any, BinaryIO, List, Optional
+
+import orjson
 
 from ..models import FeedbackRequest
 
 
 FEEDBACK_PATH = Path(__file__).resolve().parent.parent / "data" / "feedback.jsonl"
+FEEDBACK_BATCH_SIZE = 64
+FEEDBACK_FLUSH_SECONDS = 1.0
+FEEDBACK_QUEUE_SIZE = 1024
+
+logger = logging.getLogger(__name__)
 
 
-def record_feedback(feedback: FeedbackRequest) -> None:
-    FEEDBACK_PATH.parent.mkdir(parents=True, exist_ok=True)
+def build_feedback_payload(feedback: FeedbackRequest) -> dict[str, Any]:
     payload = feedback.model_dump()
     payload["timestamp"] = datetime.utcnow().isoformat(timespec="seconds")
-    with FEEDBACK_PATH.open("a", encoding="utf-8") as handle:
-        handle.write(json.dumps(payload, ensure_ascii=False) + "\n")
+    return payload
+
+
+async def feedback_writer(queue: asyncio.Queue[dict[str, Any]]) -> None:
+    """Drains the queue into feedback.jsonl, writing in batches.
+
+    A batch is flushed once it holds FEEDBACK_BATCH_SIZE payloads or
+    FEEDBACK_FLUSH_SECONDS after its first payload arrived. Anything still
+    pending is written when the task is cancelled. A failed write is logged
+    and its batch dropped; the file is reopened for the next batch.
+    """
+    loop = asyncio.get_running_loop()
+    handle: Optional[BinaryIO] = None
+    batch: List[dict[str, Any]] = []
+    in_flight: Optional[asyncio.Future[Optional[BinaryIO]]] = None
+    try:
+        while True:
+            batch.append(await queue.get())
+            deadline = loop.time() + FEEDBACK_FLUSH_SECONDS
+            while len(batch) < FEEDBACK_BATCH_SIZE:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            # Disk I/O runs in a worker thread so a slow disk never stalls the event loop.
+            pending, batch = batch, []
+            in_flight = asyncio.ensure_future(
+                asyncio.to_thread(_write_batch, handle, pending)
+            )
+            handle = await asyncio.shield(in_flight)
+            in_flight = None
+    finally:
+        if in_flight is not None:
+            # Cancelled mid-write: let that write finish before reusing its handle.
+            handle = await in_flight
+        while not queue.empty():
+            batch.append(queue.get_nowait())
+        handle = _write_batch(handle, batch)
+        if handle is not None:
+            with suppress(OSError):
+                handle.close()
+
+
+def _write_batch(
+    handle: Optional[BinaryIO], batch: List[dict[str, Any]]
+) -> Optional[BinaryIO]:
+    """Writes the batch and returns the handle to reuse, or None after a failure."""
+    if not batch:
+        return handle
+    try:
+        if handle is None:
+            FEEDBACK_PATH.parent.mkdir(parents=True, exist_ok=True)
+            handle = FEEDBACK_PATH.open("ab")
+        handle.writelines(orjson.dumps(payload) + b"\n" for payload in batch)
+        handle.flush()
+    except Exception:
+        logger.exception("Failed to write %d feedback entries", len(batch))
+        if handle is not None:
+            with suppress(OSError):
+                handle.close()
+        return None
+    return handle
@@ -6,13 +6,25 @@ import re
 from functools import lru_cache
 from typing import Optional, Tuple
 
+from geopy.extra.rate_limiter import RateLimiter
 from geopy.geocoders import Nominatim
 
 
 DEFAULT_COORDS = (56.326887, 44.005986)  # Central Nizhny Novgorod
 CITY_HINTS = ("нижний", "nizhny", "nn", "г. нижний")
 COORDINATE_RE = re.compile(
-    r"^\s*[+-]?\d{1,3}(\.\d+)?\s*[,;\s]\s*[+-]?\d{1,3}(\.\d+)?\s*$"
+    r"^\s*[+-]?\d{1,3}(\.\d+)?\s*[,;\s]\s*[+-]?\d{1,3}(\.\d+)?\s*$", re.ASCII
+)
+COORDINATE_START = frozenset("+-0123456789")
+
+# One shared client keeps HTTP connections alive; Nominatim allows ~1 request/s.
+_GEOCODER = Nominatim(user_agent="ai-tourist-assistant", timeout=10)
+_GEOCODE = RateLimiter(
+    _GEOCODER.geocode,
+    min_delay_seconds=1,
+    max_retries=2,
+    error_wait_seconds=1,
+    swallow_exceptions=False,
 )
 
 
@@ -20,11 +32,47 @@ class GeocodingError(Exception):
     """Raised when geocoding fails."""
 
 
+def _is_coordinate(part: str) -> bool:
+    """Same shape as one half of COORDINATE_RE: [+-]ddd[.ddd]."""
+    if part[:1] in ("+", "-"):
+        part = part[1:]
+    whole, dot, fraction = part.partition(".")
+    return (
+        0 < len(whole) <= 3
+        and whole.isascii()
+        and whole.isdigit()
+        and (not dot or (fraction.isascii() and fraction.isdigit()))
+    )
+
+
+def _split_coordinates(raw: str) -> Optional[Tuple[str, str]]:
+    """Fast path for "lat, lon" input that avoids the regex engine."""
+    if raw[0] not in COORDINATE_START:
+        return None
+    text = raw.replace(";", ",")
+    if "," in text:
+        first, _, second = text.partition(",")
+    else:
+        parts = text.split(None, 1)
+        if len(parts) != 2:
+            return None
+        first, second = parts
+    first, second = first.strip(), second.strip()
+    if _is_coordinate(first) and _is_coordinate(second):
+        return first, second
+    return None
+
+
+@lru_cache(maxsize=1024)
 def _normalize_query(query: str) -> str:
     raw = (query or "").strip()
     if not raw:
         return "Нижний Новгород"
 
+    coordinates = _split_coordinates(raw)
+    if coordinates:
+        return f"{coordinates[0]},{coordinates[1]}"
+
     if COORDINATE_RE.match(raw):
         parts = re.split(r"[,;\s]+", raw.strip())
         if len(parts) >= 2:
@@ -39,19 +87,28 @@ def _normalize_query(query: str) -> str:
 
 
 @lru_cache(maxsize=128)
-def geocode_location(query: str) -> Tuple[float, float]:
-    geocoder = Nominatim(user_agent="ai-tourist-assistant")
-    normalized = _normalize_query(query)
-    result = geocoder.geocode(normalized, language="ru", exactly_one=True, timeout=10)
+def _geocode_normalized(normalized: str) -> Optional[Tuple[float, float]]:
+    result = _GEOCODE(normalized, language="ru", exactly_one=True)
     if result is None:
-        raise GeocodingError(f"Не удалось определить координаты для '{query}'")
+        return None
     return result.latitude, result.longitude
 
 
+def _geocode(query: str, normalized: str) -> Tuple[float, float]:
+    coords = _geocode_normalized(normalized)
+    if coords is None:
+        raise GeocodingError(f"Не удалось определить координаты для '{query}'")
+    return coords
+
+
+def geocode_location(query: str) -> Tuple[float, float]:
+    return _geocode(query, _normalize_query(query))
+
+
 def resolve_location(query: str) -> tuple[Tuple[float, float], Optional[str]]:
+    normalized = _normalize_query(query)
     try:
-        coords = geocode_location(query)
-        normalized = _normalize_query(query)
+        coords = _geocode(query, normalized)
         if normalized != (query or "").strip():
             hint = "Интерпретируем местоположение как '" f"{normalized}'."
         else:
@@ -4,7 +4,8 @@ from __future__ import annotations
 
 import re
 from difflib import get_close_matches
-from typing import Iterable, Set
+from functools import lru_cache
+from typing import Iterable, Optional, Set
 
 
 BASE_TAGS = {
@@ -122,37 +123,35 @@ SYNONYM_MAP = {
 }
 
 
+KNOWN_TAGS = frozenset(BASE_TAGS | set(SYNONYM_MAP.values()))
+
 TOKEN_SPLIT_RE = re.compile(r"[\s,/;]+")
+TOKEN_CLEAN_RE = re.compile(r"[^a-zа-я0-9ё]+")
 
 
-def _normalize_token(token: str) -> str:
-    cleaned = token.strip().lower()
-    return re.sub(r"[^a-zа-я0-9ё]", "", cleaned)
+@lru_cache(maxsize=2048)
+def _match_tag(normalized: str) -> Optional[str]:
+    direct = SYNONYM_MAP.get(normalized)
+    if direct:
+        return direct
+    if normalized in KNOWN_TAGS:
+        return normalized
+    close = get_close_matches(normalized, KNOWN_TAGS, n=1, cutoff=0.78)
+    return close[0] if close else None
 
 
 class InterestParser:
     """Maps user-provided interests into normalized tags."""
 
-    def __init__(self) -> None:
-        self._known = BASE_TAGS | set(SYNONYM_MAP.values())
-
     def parse(self, interests: Iterable[str]) -> Set[str]:
         tags: Set[str] = set()
         for interest in interests:
-            for token in TOKEN_SPLIT_RE.split(interest):
-                if not token:
-                    continue
-                normalized = _normalize_token(token)
+            # Lowercase once per interest rather than once per token.
+            for token in TOKEN_SPLIT_RE.split(interest.lower()):
+                normalized = TOKEN_CLEAN_RE.sub("", token)
                 if not normalized:
                     continue
-                direct = SYNONYM_MAP.get(normalized)
-                if direct:
-                    tags.add(direct)
-                    continue
-                if normalized in self._known:
-                    tags.add(normalized)
-                    continue
-                close = get_close_matches(normalized, self._known, n=1, cutoff=0.78)
-                if close:
-                    tags.add(close[0])
+                tag = _match_tag(normalized)
+                if tag:
+                    tags.add(tag)
         return tags
@@ -3,13 +3,18 @@
 from __future__ import annotations
 
 import math
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import datetime
+from functools import lru_cache
 from itertools import permutations
-from typing import Iterable, List, Optional, Sequence, Tuple
+from typing import FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from numba import njit
 
 from ..models import ItineraryResponse, ItineraryStop, Place
-from .dataset import load_places
+from .dataset import load_place_table, load_places
 from .embeddings import EmbeddingProvider, EmbeddingVector
 from .geocoding import resolve_location
 from .interest_parser import InterestParser
@@ -19,12 +24,20 @@ from .narrative import NarrativeGenerator
 WALKING_SPEED_KMH = 4.2
 MAX_STOPS = 5
 MIN_STOPS = 3
+CANDIDATE_POOL_SIZE = MAX_STOPS * 4
+ROUTE_POOL_SIZE = 7
+PLAN_CACHE_SIZE = 256
 SEMANTIC_WEIGHT = 2.6
 SEMANTIC_REASON_THRESHOLD = 0.32
+EARTH_RADIUS_KM = 6371.0
 
 
+@njit(cache=True, fastmath=True)
 def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
+    lat1 = math.radians(lat1)
+    lon1 = math.radians(lon1)
+    lat2 = math.radians(lat2)
+    lon2 = math.radians(lon2)
     d_lat = lat2 - lat1
     d_lon = lon2 - lon1
     a = (
@@ -32,13 +45,38 @@ def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
         + math.cos(lat1) * math.cos(lat2) * math.sin(d_lon / 2) ** 2
     )
     c = 2 * math.asin(math.sqrt(a))
-    return 6371.0 * c
+    return EARTH_RADIUS_KM * c
+
+
+@njit(cache=True, fastmath=True, parallel=False)
+def haversine_km_batch(
+    lat1: float,
+    lon1: float,
+    lats_rad: np.ndarray,
+    lons_rad: np.ndarray,
+    out: np.ndarray,
+) -> None:
+    """Fills `out` with distances from one point (degrees) to points in radians."""
+    lat1 = math.radians(lat1)
+    lon1 = math.radians(lon1)
+    cos_lat1 = math.cos(lat1)
+    for i in range(lats_rad.shape[0]):
+        a = (
+            np.sin((lats_rad[i] - lat1) / 2) ** 2
+            + np.cos(lats_rad[i]) * cos_lat1 * np.sin((lons_rad[i] - lon1) / 2) ** 2
+        )
+        out[i] = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
 
 
 def walking_minutes(distance_km: float) -> float:
     return (distance_km / WALKING_SPEED_KMH) * 60.0
 
 
+def format_clock(minutes_since_midnight: float) -> str:
+    minute = int(minutes_since_midnight)
+    return f"{minute // 60 % 24:02d}:{minute % 60:02d}"
+
+
 @dataclass
 class Candidate:
     place: Place
@@ -48,40 +86,76 @@ class Candidate:
     semantic_score: float
 
 
+@dataclass(frozen=True)
+class PlannedRoute:
+    """Clock-independent part of a plan, cached per request parameters."""
+
+    route: Tuple[Candidate, ...]
+    leg_distances: Tuple[float, ...]
+    warnings: Tuple[str, ...]
+
+
+class NarrativeUnavailable(Exception):
+    """Raised instead of returning None so lru_cache never stores a failed narrative."""
+
+
 class ItineraryPlanner:
     def __init__(self) -> None:
         self.places = load_places()
         self.interest_parser = InterestParser()
         self.narrative = NarrativeGenerator()
         self.embedding = EmbeddingProvider()
+        self._io_executor = ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="planner-io"
+        )
+        table = load_place_table()
+        self._lats = np.radians(table.latitudes)
+        self._lons = np.radians(table.longitudes)
+        self._has_category = np.array(
+            [bool(place.category_id) for place in self.places], dtype=bool
+        )
+
+        self._place_matrix = self.embedding.embed_places(self.places)
+        all_tags = sorted(set().union(*(place.tags_set for place in self.places)))
+        self._tag_columns = {tag: column for column, tag in enumerate(all_tags)}
+        self._tag_matrix = np.zeros((len(self.places), len(all_tags)), dtype=bool)
+        for row, place in enumerate(self.places):
+            self._tag_matrix[row, [self._tag_columns[tag] for tag in place.tags_set]] = True
+
+    # Output buffers are allocated per call: plan() runs concurrently in worker threads.
+    def _distances_from(self, coords: Tuple[float, float]) -> np.ndarray:
+        distances = np.empty_like(self._lats)
+        haversine_km_batch(coords[0], coords[1], self._lats, self._lons, distances)
+        return distances
 
     def plan(
         self, interests: Iterable[str], available_hours: float, location: str
     ) -> Tuple[ItineraryResponse, List[str]]:
-        user_coords, warnings = self._resolve_user_context(location)
-        normalized_interests = self.interest_parser.parse(interests)
-        interest_vector = self.embedding.embed_interests(normalized_interests)
-        candidates = self._choose_candidates(
-            normalized_interests, user_coords, warnings, interest_vector
+        normalized_interests = frozenset(self.interest_parser.parse(interests))
+        available_hours = round(available_hours, 1)
+        # Geocoding and the interest embedding are independent network calls, so
+        # run them side by side; _plan_core then gets the vector from the embedding cache.
+        geocoding = self._io_executor.submit(self._resolve_user_context, location)
+        self.embedding.embed_interests(normalized_interests)
+        user_coords, warnings = geocoding.result()
+        planned = self._plan_core(normalized_interests, available_hours, user_coords)
+        warnings.extend(planned.warnings)
+
+        # Arrival times depend on the current clock, so only they are recomputed.
+        ordered_stops, total_minutes = self._schedule(
+            planned.route, planned.leg_distances
         )
-        route = self._build_route(candidates, user_coords, available_hours)
-        ordered_stops, total_minutes = self._schedule(route, user_coords)
-
-        itinerary_stops = [
-            candidate.place.to_stop(reason=reason, arrival_time=arrival)
-            for candidate, arrival, reason in ordered_stops
-        ]
+        itinerary_stops = self._itinerary_stops(ordered_stops)
 
-        interest_list = sorted(normalized_interests)
         time_warning = self._time_warning(total_minutes, available_hours)
         if time_warning:
             warnings.append(time_warning)
 
         summary = self._compose_summary(
-            itinerary_stops=itinerary_stops,
-            interest_list=interest_list,
+            normalized_interests=normalized_interests,
             available_hours=available_hours,
             location=location,
+            user_coords=user_coords,
             stop_count=len(ordered_stops),
         )
 
@@ -95,6 +169,56 @@ class ItineraryPlanner:
         )
         return response, warnings
 
+    @lru_cache(maxsize=PLAN_CACHE_SIZE)
+    def _plan_core(
+        self,
+        normalized_interests: FrozenSet[str],
+        available_hours: float,
+        user_coords: Tuple[float, float],
+    ) -> PlannedRoute:
+        warnings: List[str] = []
+        interest_vector = self.embedding.embed_interests(normalized_interests)
+        candidates = self._choose_candidates(
+            normalized_interests, user_coords, warnings, interest_vector
+        )
+        route, leg_distances = self._select_route(
+            candidates, user_coords, available_hours
+        )
+        return PlannedRoute(
+            route=tuple(route),
+            leg_distances=tuple(leg_distances),
+            warnings=tuple(warnings),
+        )
+
+    @lru_cache(maxsize=PLAN_CACHE_SIZE)
+    def _narrative_summary(
+        self,
+        normalized_interests: FrozenSet[str],
+        available_hours: float,
+        location: str,
+        user_coords: Tuple[float, float],
+    ) -> str:
+        planned = self._plan_core(normalized_interests, available_hours, user_coords)
+        ordered_stops, _ = self._schedule(planned.route, planned.leg_distances)
+        narrative = self.narrative.generate_summary(
+            stops=self._itinerary_stops(ordered_stops),
+            interests=sorted(normalized_interests),
+            available_hours=available_hours,
+            location=location,
+        )
+        if not narrative:
+            raise NarrativeUnavailable
+        return narrative
+
+    @staticmethod
+    def _itinerary_stops(
+        ordered_stops: Sequence[Tuple[Candidate, str, str]]
+    ) -> List[ItineraryStop]:
+        return [
+            candidate.place.to_stop(reason=reason, arrival_time=arrival)
+            for candidate, arrival, reason in ordered_stops
+        ]
+
     def _resolve_user_context(
         self, location: str
     ) -> Tuple[Tuple[float, float], List[str]]:
@@ -128,22 +252,20 @@ class ItineraryPlanner:
 
     def _compose_summary(
         self,
-        itinerary_stops: List[ItineraryStop],
-        interest_list: Sequence[str],
+        normalized_interests: FrozenSet[str],
         available_hours: float,
         location: str,
+        user_coords: Tuple[float, float],
         stop_count: int,
     ) -> str:
         default_summary = self._default_summary(
-            stop_count, available_hours, interest_list
+            stop_count, available_hours, sorted(normalized_interests)
         )
-        narrative_summary = self.narrative.generate_summary(
-            stops=itinerary_stops,
-            interests=interest_list,
-            available_hours=available_hours,
-            location=location,
-        )
-        if not narrative_summary:
+        try:
+            narrative_summary = self._narrative_summary(
+                normalized_interests, available_hours, location, user_coords
+            )
+        except NarrativeUnavailable:
             return default_summary
         return f"{narrative_summary} {default_summary}".strip()
 
@@ -166,148 +288,137 @@ class ItineraryPlanner:
         user_coords: Tuple[float, float],
         interest_vector: Optional[EmbeddingVector],
     ) -> List[Candidate]:
-        interest_set = set(normalized_interests)
-        scored: List[Candidate] = []
-        for place in self.places:
-            matched = sorted(interest_set.intersection(place.tags))
-
-            base_score = 1.0 if matched else 0.4
-
-            interest_boost = len(matched) * 1.5
-
-            distance = haversine_km(
-                user_coords[0], user_coords[1], place.latitude, place.longitude
-            )
-            distance_penalty = distance * 0.1
-
-            diversity_boost = 0.2 if place.category_id else 0.0
-
-            semantic_similarity = self.embedding.semantic_similarity(
-                interest_vector, place
-            )
-            semantic_boost = semantic_similarity * SEMANTIC_WEIGHT
-
-            score = (
-                base_score
-                + interest_boost
-                - distance_penalty
-                + diversity_boost
-                + semantic_boost
-            )
+        interest_set = frozenset(normalized_interests)
+        columns = [
+            self._tag_columns[tag] for tag in interest_set if tag in self._tag_columns
+        ]
+        match_counts = self._tag_matrix[:, columns].sum(axis=1)
+        distances = self._distances_from(user_coords)
+        semantic = self.embedding.semantic_scores(interest_vector, self._place_matrix)
+
+        base_score = np.where(match_counts > 0, 1.0, 0.4)
+        interest_boost = match_counts * 1.5
+        distance_penalty = distances * 0.1
+        diversity_boost = np.where(self._has_category, 0.2, 0.0)
+        semantic_boost = semantic * SEMANTIC_WEIGHT
+
+        scores = (
+            base_score
+            + interest_boost
+            - distance_penalty
+            + diversity_boost
+            + semantic_boost
+        )
 
-            scored.append(
-                Candidate(
-                    place=place,
-                    match_score=score,
-                    matched_tags=matched,
-                    distance_km=distance,
-                    semantic_score=semantic_similarity,
-                )
+        top = self._top_indices(scores, CANDIDATE_POOL_SIZE)
+        # Highest score first, nearer place first on ties.
+        order = top[np.lexsort((distances[top], -scores[top]))]
+        return [
+            Candidate(
+                place=self.places[idx],
+                match_score=float(scores[idx]),
+                matched_tags=sorted(interest_set & self.places[idx].tags_set),
+                distance_km=float(distances[idx]),
+                semantic_score=float(semantic[idx]),
             )
+            for idx in order
+        ]
 
-        scored.sort(key=lambda c: (c.match_score, -c.distance_km), reverse=True)
-        return scored
+    @staticmethod
+    def _top_indices(scores: np.ndarray, count: int) -> np.ndarray:
+        """Indices of the `count` highest scores, in ascending index order."""
+        if count >= len(scores):
+            return np.arange(len(scores))
+        return np.sort(np.argpartition(-scores, count - 1)[:count])
 
     def _fallback_candidates(self, user_coords: Tuple[float, float]) -> List[Candidate]:
-        popular = sorted(
-            self.places,
-            key=lambda place: (
-                min(place.estimated_visit_minutes, 120),
-                -haversine_km(
-                    user_coords[0], user_coords[1], place.latitude, place.longitude
-                ),
-            ),
-            reverse=True,
+        distances = self._distances_from(user_coords)
+        visit_minutes = np.minimum(
+            [place.estimated_visit_minutes for place in self.places], 120
         )
+        # Longest visits first, nearer place first on ties.
+        order = np.lexsort((distances, -visit_minutes))
         return [
             Candidate(
-                place=place,
+                place=self.places[idx],
                 match_score=1.0,
-                matched_tags=place.tags,
-                distance_km=haversine_km(
-                    user_coords[0], user_coords[1], place.latitude, place.longitude
-                ),
+                matched_tags=self.places[idx].tags,
+                distance_km=float(distances[idx]),
                 semantic_score=0.0,
             )
-            for place in popular[:20]
+            for idx in order[:20]
         ]
 
-    def _build_route(
+    def _select_route(
         self,
         candidates: List[Candidate],
         user_coords: Tuple[float, float],
         available_hours: float,
-    ) -> List[Candidate]:
+    ) -> Tuple[List[Candidate], List[float]]:
+        """Best ordering of the top candidates plus the length of each walked leg."""
         available_minutes = available_hours * 60
-        pool = candidates[:7]
-        best_route = []
+        pool = candidates[:ROUTE_POOL_SIZE]
+        # Point 0 is the user, point i is pool[i - 1]; every leg is measured once.
+        points = [user_coords] + [
+            (candidate.place.latitude, candidate.place.longitude) for candidate in pool
+        ]
+        distances = [
+            [haversine_km(a[0], a[1], b[0], b[1]) for b in points] for a in points
+        ]
+        travel = [[walking_minutes(distance) for distance in row] for row in distances]
+        stay = [0] + [candidate.place.estimated_visit_minutes for candidate in pool]
+
+        best_route: Tuple[int, ...] = ()
         min_total_time = float("inf")
         for num_stops in range(min(MAX_STOPS, len(pool)), MIN_STOPS - 1, -1):
-            for combo in permutations(pool, num_stops):
-                current_coords = user_coords
+            for combo in permutations(range(1, len(points)), num_stops):
+                current = 0
                 current_time = 0
-                for candidate in combo:
-                    travel_time = walking_minutes(
-                        haversine_km(
-                            current_coords[0],
-                            current_coords[1],
-                            candidate.place.latitude,
-                            candidate.place.longitude,
-                        )
-                    )
-                    current_time += travel_time + candidate.place.estimated_visit_minutes
-                    current_coords = (
-                        candidate.place.latitude,
-                        candidate.place.longitude,
-                    )
+                for stop in combo:
+                    current_time += travel[current][stop] + stay[stop]
+                    current = stop
                 if current_time <= available_minutes and current_time < min_total_time:
                     min_total_time = current_time
-                    best_route = list(combo)
+                    best_route = combo
             if best_route:
                 break
-        if not best_route and candidates:
+
+        if best_route:
+            legs = zip((0,) + best_route, best_route)
+            return (
+                [pool[stop - 1] for stop in best_route],
+                [distances[start][stop] for start, stop in legs],
+            )
+        if candidates:
             first_candidate = candidates[0]
-            travel = walking_minutes(
-                haversine_km(
-                    user_coords[0],
-                    user_coords[1],
-                    first_candidate.place.latitude,
-                    first_candidate.place.longitude,
-                )
+            cost = (
+                walking_minutes(first_candidate.distance_km)
+                + first_candidate.place.estimated_visit_minutes
             )
-            cost = travel + first_candidate.place.estimated_visit_minutes
             if cost <= available_minutes:
-                return [first_candidate]
-        return best_route
+                return [first_candidate], [first_candidate.distance_km]
+        return [], []
 
     def _schedule(
         self,
         route: Sequence[Candidate],
-        user_coords: Tuple[float, float],
+        leg_distances: Sequence[float],
         start_time: datetime | None = None,
     ) -> Tuple[List[Tuple[Candidate, str, str]], float]:
         if start_time is None:
-            start_time = datetime.now().replace(second=0, microsecond=0)
+            start_time = datetime.now()
 
         scheduled: List[Tuple[Candidate, str, str]] = []
-        current_time = start_time
-        current_coords = user_coords
+        current_minute = float(start_time.hour * 60 + start_time.minute)
         total_minutes = 0.0
 
-        for candidate in route:
-            distance = haversine_km(
-                current_coords[0],
-                current_coords[1],
-                candidate.place.latitude,
-                candidate.place.longitude,
-            )
+        for candidate, distance in zip(route, leg_distances):
             travel = walking_minutes(distance)
-            arrival_time = current_time + timedelta(minutes=travel)
+            arrival_minute = current_minute + travel
             stay = candidate.place.estimated_visit_minutes
             reason = self._build_reason(candidate, distance)
-            scheduled.append((candidate, arrival_time.strftime("%H:%M"), reason))
-            current_time = arrival_time + timedelta(minutes=stay)
-            current_coords = (candidate.place.latitude, candidate.place.longitude)
+            scheduled.append((candidate, format_clock(arrival_minute), reason))
+            current_minute = arrival_minute + stay
             total_minutes += travel + stay
 
         return scheduled, total_minutes
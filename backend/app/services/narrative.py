@@ -8,6 +8,7 @@ from typing import Iterable, Optional
 from mistralai import Mistral
 
 from ..models import ItineraryStop
+from ._http import SHARED_CLIENT
 
 
 class NarrativeGenerator:
@@ -19,7 +20,7 @@ class NarrativeGenerator:
         self._client: Optional[Mistral] = None
         self._model = model
         if api_key:
-            self._client = Mistral(api_key=api_key)
+            self._client = Mistral(api_key=api_key, client=SHARED_CLIENT)
 
     def generate_summary(
         self,